@@ -2,9 +2,12 @@
 
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Package:
-    """A simple data class to represent an installed Python package."""
+    """
+    A simple data class to represent an installed Python package.
+    Slotted, since one instance exists per installed package.
+    """
     name: str
     version: str
     latest_version: str = ""
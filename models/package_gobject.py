@@ -17,30 +17,46 @@ class PackageGObject(GObject.Object):
     name = GObject.Property(type=str, nick='Package Name')
     version = GObject.Property(type=str, nick='Version')
     is_outdated = GObject.Property(type=bool, nick='Is Outdated', default=False)
-    size_bytes = GObject.Property(type=int, nick='Size in Bytes')
+    # 64-bit, since a plain int property is a gint and large packages exceed 2 GiB
+    size_bytes = GObject.Property(type=GObject.TYPE_INT64, nick='Size in Bytes', default=0)
     size_str = GObject.Property(type=str, nick='Formatted Size')
     display_version = GObject.Property(type=str, nick='Display Version')
+    # Orders the version column: outdated packages first, then by name
+    sort_key = GObject.Property(type=str, nick='Version Sort Key')
 
     def __init__(self, pkg: Package):
         super().__init__()
         self._pkg = pkg # Keep the original data object
+        # Computed once; a package's name never changes
+        self.name_lower = pkg.name.lower()
+        self._display_sig = None # The values last copied by sync()
+        self.sync()
 
-    # When GTK asks for a property, we return the data from our internal object
-    def do_get_property(self, prop):
-        if prop.name == 'name':
-            return self._pkg.name
-        elif prop.name == 'version':
-            return self._pkg.version
-        elif prop.name == 'is_outdated':
-            return self._pkg.is_outdated
-        elif prop.name == 'size_bytes':
-            return self._pkg.size_bytes
-        elif prop.name == 'size_str':
-            return self._pkg.size_str
-        elif prop.name == 'display_version':
-            return self._pkg.display_version
-        else:
-            raise AttributeError(f'unknown property {prop.name}')
+    # Property values are stored on the GObject itself, so reads never have to
+    # dispatch back into the dataclass. Call sync() after the package changes.
+    def sync(self) -> bool:
+        """
+        Copies the current state of the wrapped Package into the properties.
+        Returns False, without touching the properties, if nothing shown has changed.
+        """
+        pkg = self._pkg
+        sig = (pkg.version, pkg.is_outdated, pkg.size_bytes, pkg.size_str, pkg.display_version)
+        if sig == self._display_sig:
+            return False
+        self._display_sig = sig
+        self.name = pkg.name
+        self.version = pkg.version
+        self.is_outdated = pkg.is_outdated
+        self.size_bytes = pkg.size_bytes
+        self.size_str = pkg.size_str
+        self.display_version = pkg.display_version
+        self.sort_key = ("0" if pkg.is_outdated else "1") + self.name_lower
+        return True
+
+    def set_package(self, pkg: Package) -> bool:
+        """Wraps a newer Package of the same name; returns True if anything shown changed."""
+        self._pkg = pkg
+        return self.sync()
 
     # Allow the UI to get the underlying package data if needed
     def get_package_data(self) -> Package:
@@ -26,6 +26,12 @@ class PipManagerApp(Gtk.Application):
             self.window = PipManagerWindow(application=self)
         self.window.present()
 
+    def do_shutdown(self):
+        """Called when the application exits."""
+        if self.window:
+            self.window.logic.shutdown()
+        Gtk.Application.do_shutdown(self)
+
 def _gtk_log_handler(domain, level, message):
     if "GtkText - did not receive a focus-out event." in message:
         return # Suppress this specific warning
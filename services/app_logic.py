@@ -1,12 +1,17 @@
 # FILE: services/app_logic.py
 
+import collections
 import threading
+import time
+import traceback
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from gi.repository import GLib
 
 # Import project modules
 from models.package import Package
 from services.pip_service import PipService
-from services.cache_service import load_size_cache, save_size_cache
+from services.cache_service import (load_size_cache, save_size_cache,
+                                    load_outdated_cache, save_outdated_cache)
 
 class AppLogic:
     """
@@ -23,24 +28,87 @@ class AppLogic:
         self.is_busy = False
         self.packages_data: dict[str, Package] = {}
         self.size_cache = load_size_cache()
+        self._outdated_checked_at = None # When the shown update info was last fetched
         
-        # --- Threading Locks ---
-        self.active_size_calculations = 0
+        # --- Threading ---
+        # All background work runs on this pool instead of a fresh thread per operation.
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='pipman-op')
         self._main_lock = threading.Lock()
-        self._size_calculation_lock = threading.Lock()
+
+        # --- Batched Log Output ---
+        self._pending_logs = collections.deque()
+        self._log_lock = threading.Lock()
+        self._log_flush_scheduled = False
+
+        # --- Batched Row Updates ---
+        self._pending_view_updates: set[str] = set()
+        self._view_update_source_id = 0
+        self._view_update_lock = threading.Lock()
+
+        # --- Size Cache Persistence ---
+        # Changes only mark the cache dirty; a short timer writes it out once.
+        self._size_cache_dirty = False
+        self._size_cache_flush_id = 0
 
     # --- Private UI Callback Wrappers ---
     def _ui_log(self, message: str, is_header: bool = False):
-        GLib.idle_add(self.callbacks['log_output'], message, is_header)
+        # pip can print thousands of lines; they are queued and handed over in
+        # batches by a single idle callback rather than one callback per line.
+        with self._log_lock:
+            self._pending_logs.append((message, is_header))
+            if self._log_flush_scheduled:
+                return
+            self._log_flush_scheduled = True
+        GLib.idle_add(self._flush_logs)
+
+    def _flush_logs(self):
+        with self._log_lock:
+            pending = list(self._pending_logs)
+            self._pending_logs.clear()
+            self._log_flush_scheduled = False
+        plain_lines = []
+        for message, is_header in pending:
+            if not is_header:
+                plain_lines.append(message)
+                continue
+            if plain_lines:
+                self.callbacks['log_output']("\n".join(plain_lines))
+                plain_lines.clear()
+            self.callbacks['log_output'](message, True)
+        if plain_lines:
+            self.callbacks['log_output']("\n".join(plain_lines))
+        return False
 
     def _ui_set_busy_on_main_thread(self, busy: bool):
         GLib.idle_add(self.callbacks['set_busy'], busy)
 
     def _ui_update_package_list(self):
-        GLib.idle_add(self.callbacks['update_package_list'], list(self.packages_data.keys()))
+        # packages_data is built in str.casefold name order. The UI's in-place list
+        # update requires the same stable order on every refresh. It is only roughly
+        # the name column's order (GTK collates '-', '_' and '.' differently), so for
+        # the sorter it is just a hint.
+        # Populating the list is what the user waits for, so it runs ahead of other idle work.
+        GLib.idle_add(self.callbacks['update_package_list'], list(self.packages_data.values()),
+                      priority=GLib.PRIORITY_HIGH_IDLE)
 
     def _ui_update_package_view(self, pkg_name: str):
-        GLib.idle_add(self.callbacks['update_package_view'], pkg_name)
+        # Row updates are collected and handed to the UI together on a short timer,
+        # instead of one main-loop round trip per package.
+        with self._view_update_lock:
+            self._pending_view_updates.add(pkg_name)
+            if not self._view_update_source_id:
+                self._view_update_source_id = GLib.timeout_add(50, self._flush_package_view_updates)
+
+    def _flush_package_view_updates(self):
+        with self._view_update_lock:
+            pkg_names = list(self._pending_view_updates)
+            self._pending_view_updates.clear()
+            self._view_update_source_id = 0
+        self.callbacks['update_package_views'](pkg_names)
+        return False
+
+    def _ui_refresh_package_views(self):
+        GLib.idle_add(self.callbacks['refresh_package_views'], priority=GLib.PRIORITY_DEFAULT_IDLE)
 
     def _ui_set_total_size_label(self, text: str):
         GLib.idle_add(self.callbacks['set_total_size_label'], text)
@@ -77,20 +145,80 @@ class AppLogic:
 
     
 
+    def _mark_size_cache_dirty(self):
+        """Schedules a single write of the size cache, coalescing changes made in the meantime."""
+        with self._main_lock:
+            self._size_cache_dirty = True
+            if self._size_cache_flush_id:
+                return
+            self._size_cache_flush_id = GLib.timeout_add_seconds(2, self._flush_size_cache)
+
+    def _flush_size_cache(self):
+        with self._main_lock:
+            self._size_cache_flush_id = 0
+            if not self._size_cache_dirty:
+                return False
+            self._size_cache_dirty = False
+            cache_snapshot = dict(self.size_cache)
+        save_size_cache(cache_snapshot)
+        return False
+
+    def flush_size_cache(self):
+        """Writes pending size cache changes now instead of waiting for the timer."""
+        with self._main_lock:
+            if self._size_cache_flush_id:
+                GLib.source_remove(self._size_cache_flush_id)
+                self._size_cache_flush_id = 0
+        self._flush_size_cache()
+
+    def _drop_cached_size(self, pkg_name: str):
+        """Removes a package's cached size and writes the cache out right away."""
+        with self._main_lock:
+            if self.size_cache.pop(pkg_name, None) is None:
+                return
+            self._size_cache_dirty = True
+        self.flush_size_cache()
+
+    def _submit(self, fn, *args):
+        """Runs fn on the operation pool, printing its traceback if it fails."""
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._report_worker_exception)
+        return future
+
+    def _report_worker_exception(self, future):
+        # An exception would otherwise stay in the Future, which nothing reads
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None and not isinstance(exc, CancelledError):
+            traceback.print_exception(exc)
+
     # --- Public Methods (Called by the UI) ---
+    def shutdown(self):
+        """Called when the application exits; persists any unsaved cache changes."""
+        self.flush_size_cache()
+        # Queued work is dropped and an update check is interrupted. A running
+        # install/update/uninstall is left to finish, so the process only outlives
+        # the window for as long as that pip command takes.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.pip_service.shutdown()
+
     def load_packages(self):
         if not self._begin_operation("Refreshing package list"):
             return
         
         self._ui_set_total_size_label("Total Size: ...")
-        threading.Thread(target=self._initial_load_worker, daemon=True).start()
+        # The outdated query doesn't depend on the local list, so both start here
+        # at once; Phase 2 only waits for the query's result once Phase 1 is done.
+        outdated_future = self.pip_service.start_outdated_check()
+        self._submit(self._initial_load_worker, outdated_future)
 
     def install_package(self, package_name: str):
         if not package_name:
             self._ui_log("Please enter a package name.")
             return
         
-        cmd = ['pip', 'install', '--user', package_name]
+        cmd = self.pip_service.pip_command('install', '--user', package_name)
         self._run_pip_command_threaded(
             cmd, 
             f"Install '{package_name}'", 
@@ -101,29 +229,26 @@ class AppLogic:
     def update_package(self, pkg_name: str):
         # <--- ADD THIS LOGIC ---
         # Invalidate the cache for this package to force a size recalculation after update.
-        if pkg_name in self.size_cache:
-            del self.size_cache[pkg_name]
+        self._drop_cached_size(pkg_name)
         # ---> END OF ADDITION
 
-        cmd = ['pip', 'install', '--user', '--upgrade', pkg_name]
+        cmd = self.pip_service.pip_command('install', '--user', '--upgrade', pkg_name)
         self._run_pip_command_threaded(cmd, f"Update '{pkg_name}'", pkg_name, lambda n: self.load_packages())
 
     def uninstall_package(self, pkg_name: str):
-        if pkg_name in self.size_cache:
-            del self.size_cache[pkg_name]
-            save_size_cache(self.size_cache)
+        self._drop_cached_size(pkg_name)
         
-        cmd = ['pip', 'uninstall', '-y', pkg_name]
+        cmd = self.pip_service.pip_command('uninstall', '-y', pkg_name)
         self._run_pip_command_threaded(cmd, f"Uninstall '{pkg_name}'", pkg_name, lambda n: self.load_packages())
 
     def clear_pip_cache(self):
-        cmd = ['pip', 'cache', 'purge']
+        cmd = self.pip_service.pip_command('cache', 'purge')
         self._run_pip_command_threaded(cmd, "Clear pip cache")
 
     def check_dependencies(self):
         if not self._begin_operation("Checking package dependencies"):
             return
-        threading.Thread(target=self._check_dependencies_worker, daemon=True).start()
+        self._submit(self._check_dependencies_worker)
 
     def show_package_details(self, pkg_name: str):
         if not self._begin_operation(f"Fetching details for '{pkg_name}'...", is_header=False):
@@ -139,19 +264,43 @@ class AppLogic:
             finally:
                 self._end_operation()
 
-        threading.Thread(target=worker, daemon=True).start()
+        self._submit(worker)
 
     # --- Internal Worker Threads ---
-    def _initial_load_worker(self):
+    def _initial_load_worker(self, outdated_future):
         """Phase 1: Loads local packages and sizes for immediate UI display."""
         try:
             packages_json = self.pip_service.get_local_packages()
             
+            versions = {pkg_dict['name']: pkg_dict['version'] for pkg_dict in packages_json}
             new_packages_data = {}
-            for pkg_dict in sorted(packages_json, key=lambda p: p['name'].lower()):
+            # Sorting the bare names lets str.casefold (a C builtin) serve as the key,
+            # with no per-package lambda or dict lookup.
+            for name in sorted(versions, key=str.casefold):
                 # Initially, assume all packages are up-to-date.
-                pkg = Package(name=pkg_dict['name'], version=pkg_dict['version'])
-                new_packages_data[pkg.name] = pkg
+                new_packages_data[name] = Package(name=name, version=versions[name])
+
+            # Show the last known update info until the live check completes,
+            # skipping entries whose installed version has changed since.
+            cached_outdated, self._outdated_checked_at = load_outdated_cache()
+            for name, cached_info in cached_outdated.items():
+                pkg = new_packages_data.get(name)
+                if pkg and pkg.version == cached_info.get('version'):
+                    pkg.latest_version = cached_info.get('latest_version', '')
+
+            # Apply cached sizes before the list reaches the UI, so cache hits
+            # never need a per-row redraw.
+            pending_sizes = []
+            for name, pkg in new_packages_data.items():
+                # Sizes are cached per version, so an entry from before an
+                # upgrade (or from an older cache format) is recalculated.
+                cached_data = self.size_cache.get(name)
+                if cached_data and cached_data.get('version') == pkg.version:
+                    pkg.size_bytes = cached_data['size_bytes']
+                    pkg.size_str = cached_data['size_str']
+                else:
+                    # Otherwise, mark for calculation
+                    pending_sizes.append(name)
 
             with self._main_lock:
                 self.packages_data = new_packages_data
@@ -160,22 +309,10 @@ class AppLogic:
             self._ui_update_package_list()
             self._ui_log(f"Found {len(self.packages_data)} local packages. Checking for updates in the background...")
             
-            # Start size calculation logic as before
-            num_to_calculate = 0
-            for name, pkg in self.packages_data.items():
-                cached_data = self.size_cache.get(name)
-                if cached_data and 'size_bytes' in cached_data and 'size_str' in cached_data:
-                    # If valid cache entry exists, apply it directly
-                    pkg.size_bytes = cached_data['size_bytes']
-                    pkg.size_str = cached_data['size_str']
-                    self._ui_update_package_view(name)
-                else:
-                    # Otherwise, mark for calculation
-                    pkg.size_str = "..."
-                    num_to_calculate += 1
-                    self.calculate_size_for_package(name)
-
-            if num_to_calculate == 0:
+            if pending_sizes:
+                self._ui_set_total_size_label("Total Size: Calculating...")
+                self._submit(self._calculate_sizes_worker, pending_sizes)
+            else:
                 self._ui_log("All package sizes loaded from cache.")
                 self._calculate_and_display_total_size()
                 # We can end the primary "busy" state here if no sizes need calculating.
@@ -183,38 +320,53 @@ class AppLogic:
                 self._end_operation()
 
             # --- KEY CHANGE: Start Phase 2 in a separate thread ---
-            threading.Thread(target=self._check_for_updates_worker, daemon=True).start()
+            self._submit(self._check_for_updates_worker, outdated_future)
 
         except Exception as e:
             self._ui_log(f"A critical error occurred while loading local packages: {e}")
             self._end_operation()
 
-    def _check_for_updates_worker(self):
-        """Phase 2: Checks for outdated packages in the background and updates the UI."""
+    def _check_for_updates_worker(self, outdated_future):
+        """Phase 2: Waits for the outdated-package check started in Phase 1 and updates the UI."""
         self._ui_log("Checking for package updates...")
-        outdated_info, status_message = self.pip_service.get_outdated_packages()
+        outdated_info, status_message = outdated_future.result()
         
         if status_message:
+            # The check failed; keep showing the cached update info.
             self._ui_log(status_message)
-        
-        if not outdated_info:
-            if not status_message:
-                self._ui_log("All packages are up to date.")
+            if self._outdated_checked_at:
+                minutes = int((time.time() - self._outdated_checked_at) // 60)
+                self._ui_log(f"Showing update info from the last check, {minutes} min ago.")
             return
 
-        # Use a lock to safely modify the shared package data
+        # Use a lock to safely modify the shared package data; only the in-memory
+        # updates happen under it, the cache file is written after it is released.
+        changed_names = []
         with self._main_lock:
-            for name, latest_version in outdated_info.items():
-                if name in self.packages_data:
-                    self.packages_data[name].latest_version = latest_version
-                    # Tell the UI to redraw just this one row
-                    self._ui_update_package_view(name)
+            for name, pkg in self.packages_data.items():
+                latest_version = outdated_info.get(name, "")
+                if pkg.latest_version != latest_version:
+                    pkg.latest_version = latest_version
+                    changed_names.append(name)
+            outdated_cache = {
+                name: {"version": self.packages_data[name].version, "latest_version": latest_version}
+                for name, latest_version in outdated_info.items() if name in self.packages_data
+            }
+            self._outdated_checked_at = time.time()
+
+        # Tell the UI to redraw just the rows that changed
+        for name in changed_names:
+            self._ui_update_package_view(name)
+        save_outdated_cache(outdated_cache)
         
         # Tell the main thread to re-evaluate button sensitivity, as some packages
         # may now be updatable.
         GLib.idle_add(self.callbacks['update_button_sensitivity'])
         
-        self._ui_log(f"Update check complete. Found {len(outdated_info)} outdated package(s).")
+        if outdated_info:
+            self._ui_log(f"Update check complete. Found {len(outdated_info)} outdated package(s).")
+        else:
+            self._ui_log("All packages are up to date.")
 
     def _run_pip_command_threaded(self, command_list, operation_name, pkg_name_for_callback=None, callback_on_finish=None):
         if not self._begin_operation(f"Starting: {operation_name}"):
@@ -236,9 +388,9 @@ class AppLogic:
                     self._end_operation()
                 
                 if success and "cache" in command_list:
-                    threading.Thread(target=self._update_cache_size_display_worker, daemon=True).start()
+                    self._submit(self._update_cache_size_display_worker)
         
-        threading.Thread(target=worker, daemon=True).start()
+        self._submit(worker)
 
     def _check_dependencies_worker(self):
         try:
@@ -261,45 +413,25 @@ class AppLogic:
     def _on_install_success(self, pkg_name: str):
         self.load_packages()
 
-    def calculate_size_for_package(self, pkg_name: str):
-        if not pkg_name: return
-        self._adjust_ui_for_ongoing_calculations(calculation_starting=True)
-
-        def worker():
-            # This check is a failsafe, but get_package_size should be robust.
-            if not self.pip_service: return 
-
-            self._ui_log(f"Calculating size for '{pkg_name}'...")
-            size_bytes, size_str = self.pip_service.get_package_size(pkg_name)
+    def _calculate_sizes_worker(self, pkg_names: list[str]):
+        """Calculates all missing package sizes in one batch and refreshes the view once."""
+        try:
+            self._ui_log(f"Calculating sizes for {len(pkg_names)} package(s)...")
+            sizes = self.pip_service.get_all_sizes(pkg_names)
 
             with self._main_lock:
-                if pkg_name not in self.packages_data:
-                    self._ui_log(f"Calculation for '{pkg_name}' cancelled (package removed).")
-                    self._adjust_ui_for_ongoing_calculations(calculation_starting=False)
-                    return
-                
-                self.packages_data[pkg_name].size_bytes = size_bytes
-                self.packages_data[pkg_name].size_str = size_str
-                self.size_cache[pkg_name] = {"size_bytes": size_bytes, "size_str": size_str}
-                save_size_cache(self.size_cache)
-
-            self._ui_update_package_view(pkg_name)
-            self._ui_log(f"Size for '{pkg_name}': {size_str}")
-            self._adjust_ui_for_ongoing_calculations(calculation_starting=False)
-        
-        threading.Thread(target=worker, daemon=True).start()
-
-
-    def _adjust_ui_for_ongoing_calculations(self, calculation_starting: bool):
-        with self._size_calculation_lock:
-            if calculation_starting:
-                self.active_size_calculations += 1
-                if self.active_size_calculations == 1:
-                    self._ui_set_total_size_label("Total Size: Calculating...")
-            else:
-                self.active_size_calculations -= 1
-                if self.active_size_calculations == 0:
-                    self._calculate_and_display_total_size()
-                    self._ui_log("All package sizes calculated and updated.")
-                    # The main 'load_packages' task is now complete.
-                    self._end_operation()
\ No newline at end of file
+                for pkg_name, (size_bytes, size_str) in sizes.items():
+                    pkg = self.packages_data.get(pkg_name)
+                    if pkg is None:
+                        continue # Package removed while calculating
+                    pkg.size_bytes = size_bytes
+                    pkg.size_str = size_str
+                    self.size_cache[pkg_name] = {"version": pkg.version, "size_bytes": size_bytes, "size_str": size_str}
+            self._mark_size_cache_dirty()
+
+            self._ui_refresh_package_views()
+            self._calculate_and_display_total_size()
+            self._ui_log("All package sizes calculated and updated.")
+        finally:
+            # The main 'load_packages' task is now complete.
+            self._end_operation()
@@ -1,34 +1,89 @@
 # FILE: services/cache_service.py
 
-import json
+from services import json_compat
+import os
+import pickle
 from pathlib import Path
 from gi.repository import GLib
 import threading # Import threading
+import time
 
 # --- Data Caching ---
 CACHE_DIR = Path(GLib.get_user_cache_dir()) / 'pipman'
-CACHE_FILE = CACHE_DIR / 'sizes.json'
+# The size cache is a local throwaway file, so it uses pickle, the fastest stdlib format.
+CACHE_FILE = CACHE_DIR / 'sizes.pkl'
+LEGACY_CACHE_FILE = CACHE_DIR / 'sizes.json'
+OUTDATED_CACHE_FILE = CACHE_DIR / 'outdated.json'
+OUTDATED_CACHE_TTL = 6 * 60 * 60 # Seconds before cached update info is ignored
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 _cache_save_lock = threading.Lock() # Create a lock specifically for saving the cache file
 
+def _write_atomic(path: Path, data: bytes):
+    """Writes data to a temporary file and renames it over path, so readers never see a partial file."""
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
 def load_size_cache():
-    """Loads the package size cache from a JSON file."""
+    """Loads the package size cache, importing the old JSON cache once if needed."""
     if not CACHE_FILE.exists():
+        return _migrate_json_size_cache()
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            cache_data = pickle.load(f)
+    except Exception:
+        # If file is corrupted or unreadable, treat as empty cache. Unpickling
+        # garbage can raise almost anything (e.g. ImportError, IndexError).
+        return {}
+    return cache_data if isinstance(cache_data, dict) else {}
+
+def _migrate_json_size_cache():
+    """Converts a size cache left by older versions (sizes.json) to the pickle format."""
+    if not LEGACY_CACHE_FILE.exists():
         return {}
     try:
-        with open(CACHE_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        # If file is corrupted or unreadable, treat as empty cache
+        cache_data = json_compat.loads(LEGACY_CACHE_FILE.read_bytes())
+    except (json_compat.JSONDecodeError, IOError):
+        return {}
+    if not isinstance(cache_data, dict):
         return {}
+    save_size_cache(cache_data)
+    LEGACY_CACHE_FILE.unlink(missing_ok=True)
+    return cache_data
 
 def save_size_cache(cache_data):
-    """Saves the package size cache to a JSON file in a thread-safe manner."""
+    """Saves the package size cache to a file in a thread-safe manner."""
     with _cache_save_lock: # Acquire the lock before writing
         try:
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            _write_atomic(CACHE_FILE, pickle.dumps(cache_data, protocol=pickle.HIGHEST_PROTOCOL))
         except IOError as e:
             # In a real app, you might log this to your app's main log
-            print(f"Error saving size cache: {e}")
\ No newline at end of file
+            print(f"Error saving size cache: {e}")
+
+def load_outdated_cache():
+    """
+    Loads the last successful outdated-package check.
+    Returns a tuple of ({name: {"version": ..., "latest_version": ...}}, timestamp).
+    The dict is empty and the timestamp None if the cache is missing, unreadable
+    or older than OUTDATED_CACHE_TTL.
+    """
+    if not OUTDATED_CACHE_FILE.exists():
+        return {}, None
+    try:
+        cache_data = json_compat.loads(OUTDATED_CACHE_FILE.read_bytes())
+        timestamp = cache_data.get('timestamp', 0)
+        if time.time() - timestamp > OUTDATED_CACHE_TTL:
+            return {}, None
+        return cache_data.get('packages', {}), timestamp
+    except (json_compat.JSONDecodeError, IOError, AttributeError):
+        return {}, None
+
+def save_outdated_cache(outdated_data):
+    """Saves the result of an outdated-package check along with the current time."""
+    with _cache_save_lock:
+        try:
+            _write_atomic(OUTDATED_CACHE_FILE,
+                          json_compat.dumps({'timestamp': time.time(), 'packages': outdated_data}))
+        except IOError as e:
+            print(f"Error saving outdated cache: {e}")
@@ -0,0 +1,37 @@
+# FILE: services/json_compat.py
+
+# Uses orjson for parsing pip output and writing cache files when it is
+# installed, and falls back to the standard library otherwise.
+try:
+    import orjson
+
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def loads(data):
+        """Parses JSON from a str or bytes object."""
+        return orjson.loads(data)
+
+    def load(fp):
+        """Parses JSON from a binary file object."""
+        return orjson.loads(fp.read())
+
+    def dumps(obj) -> bytes:
+        """Serializes obj to indented, UTF-8 encoded JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    import json
+
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data):
+        """Parses JSON from a str or bytes object."""
+        return json.loads(data)
+
+    def load(fp):
+        """Parses JSON from a binary file object."""
+        return json.load(fp)
+
+    def dumps(obj) -> bytes:
+        """Serializes obj to indented, UTF-8 encoded JSON."""
+        return json.dumps(obj, indent=2).encode('utf-8')
@@ -1,34 +1,172 @@
 # FILE: services/pip_service.py
 
 import subprocess
-import json
+import sys
+import threading
+import time
+import http.client
+import configparser
+from urllib.parse import urlsplit
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
+import site
 import socket
 from importlib import metadata
 from pathlib import Path
+import re
+import os
+
+from services import json_compat
+
+# Version comparison for the PyPI update check. Without 'packaging' the check
+# falls back to 'pip list --outdated'.
+try:
+    from packaging.version import InvalidVersion, Version
+except ImportError:
+    Version = None
+
+PYPI_HOST = "pypi.org"
+PYPI_MAX_REDIRECTS = 3 # PyPI redirects non-canonical project names to the canonical URL
+# Settings that change where or how pip reaches the index: another index, a proxy,
+# or custom certificates/trusted hosts. The direct PyPI check honours none of them,
+# so when any is present the update check is left to 'pip list --outdated'.
+_NETWORK_ENV_VARS = (
+    'PIP_INDEX_URL', 'PIP_EXTRA_INDEX_URL', 'PIP_FIND_LINKS', 'PIP_NO_INDEX',
+    'PIP_PROXY', 'HTTPS_PROXY', 'https_proxy', 'ALL_PROXY', 'all_proxy',
+    'PIP_CERT', 'PIP_CLIENT_CERT', 'PIP_TRUSTED_HOST', 'REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE',
+)
+_NETWORK_CONFIG_KEYS = frozenset((
+    'index-url', 'extra-index-url', 'find-links', 'no-index',
+    'proxy', 'cert', 'client-cert', 'trusted-host',
+))
+_PIP_CONFIG_FILES = (
+    os.path.join(sys.prefix, 'pip.conf'),
+    os.path.expanduser('~/.pip/pip.conf'),
+    os.path.join(os.environ.get('XDG_CONFIG_HOME', os.path.expanduser('~/.config')), 'pip', 'pip.conf'),
+    '/etc/pip.conf',
+    '/etc/xdg/pip/pip.conf',
+)
+
+# Finds the number (int or float) and unit (GB, MB, kB, B) on each "... size:" line of 'pip cache info'
+# (a bytes pattern, so pip's raw output is searched without decoding it first)
+_CACHE_SIZE_PATTERN = re.compile(rb'size:[^\n]*?(\d+\.?\d*)\s*(GB|MB|kB|B)', re.IGNORECASE)
+# Bytes per unit, keyed by the upper-cased unit from _CACHE_SIZE_PATTERN
+_UNIT_BYTES = {b'B': 1, b'KB': 1024, b'MB': 1024**2, b'GB': 1024**3}
+
+def _normalize_name(name: str) -> str:
+    """Normalizes a project name as described in PEP 503."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+def _format_size(total_size: int) -> str:
+    """Formats a package size in bytes as a human-readable string."""
+    if total_size < 1024:
+        return f"{total_size} B"
+    elif total_size < 1024**2:
+        return f"{total_size / 1024:.1f} KB"
+    elif total_size < 1024**2 * 999: # Show MB up to 999
+        return f"{total_size / (1024**2):.2f} MB"
+    else: # Show GB for larger sizes
+        return f"{total_size / (1024**3):.2f} GB"
+
+def _scan_file_sizes(directory: str, file_names: set[str]) -> int:
+    """Sums the sizes of the named regular files in a directory with a single os.scandir pass."""
+    total_size = 0
+    remaining = len(file_names)
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name in file_names:
+                    if entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                    remaining -= 1
+                    if not remaining:
+                        break # Stop reading large directories once every file is found
+    except OSError:
+        pass # Directory missing or unreadable; count nothing for it
+    return total_size
 
 class PipService:
     """A service class to handle all subprocess calls to pip."""
 
+    # 'pip list --outdated' queries the index once per package, so this has to
+    # allow for large environments; the check never blocks the package list.
+    OUTDATED_CHECK_TIMEOUT = 15
+    NETWORK_CHECK_TTL = 30 # Seconds a connectivity probe result is reused
+    PYPI_REQUEST_TIMEOUT = 10 # Seconds for a single PyPI JSON request
+
+    def __init__(self):
+        # Runs pip queries that can overlap with other work (e.g. the update check)
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        self._net_cache = (float('-inf'), False) # (time.monotonic() of last probe, result)
+        # Where 'pip install --user' puts packages; resolved once
+        self._user_site = site.getusersitepackages()
+        # Queries the PyPI JSON API in parallel; each thread keeps its own HTTPS connection open
+        self._http_pool = ThreadPoolExecutor(max_workers=16)
+        self._http_local = threading.local()
+        # Work that shutdown() has to interrupt: open PyPI connections and a running
+        # 'pip list --outdated', so an update check never holds up the app's exit.
+        self._closing = threading.Event()
+        self._active_lock = threading.Lock()
+        self._http_conns: set[http.client.HTTPSConnection] = set()
+        self._outdated_proc = None
+        # Sizes packages in parallel; bounded so a large environment can't spawn a thread per package
+        self._size_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        # Environment for every pip subprocess: skip pip's version self-check
+        # (a network roundtrip) and don't write .pyc files for pip's own imports.
+        self._pip_env = {
+            **os.environ,
+            'PIP_DISABLE_PIP_VERSION_CHECK': '1',
+            'PYTHONDONTWRITEBYTECODE': '1',
+        }
+
+    def pip_command(self, *args: str) -> list[str]:
+        """
+        Builds the argument list for a pip invocation.
+        Every pip call goes through here, so how pip is launched is decided in one place.
+        pip runs as a module of the interpreter running the app, so the packages it
+        manages are the ones this app sees, whatever 'pip' on PATH points at.
+        """
+        return [sys.executable, '-m', 'pip', *args]
+
+    def shutdown(self):
+        """
+        Called when the application exits. Cancels queued work on every pool and
+        interrupts a running update check, whose worker threads would otherwise
+        keep the interpreter alive until the check finished.
+        """
+        self._closing.set()
+        for pool in (self._pool, self._http_pool, self._size_pool):
+            pool.shutdown(wait=False, cancel_futures=True)
+        with self._active_lock:
+            proc = self._outdated_proc
+            conns = list(self._http_conns)
+        if proc is not None:
+            proc.kill()
+        for conn in conns:
+            sock = conn.sock
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR) # Wakes up a thread blocked on the response
+                except OSError:
+                    pass
+
     def run_command(self, command_list, log_callback):
         """Runs a generic command, streaming its output to the log_callback."""
         try:
-            # Using Popen to capture output line-by-line for live logging
-            process = subprocess.Popen(
+            # Using Popen to capture output as it is produced for live logging
+            # The context manager closes the pipe and reaps pip even if logging fails.
+            with subprocess.Popen(
                 command_list,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT, # Combine stdout and stderr
-                text=True,
-                encoding='utf-8',
-                bufsize=1 # Line-buffered
-            )
-            
-            # Stream output to the logger
-            for line in iter(process.stdout.readline, ''):
-                log_callback(line.strip())
-            
-            process.wait()
-            # Since we combined streams, stderr will be None.
+                env=self._pip_env,
+            ) as process:
+                self._stream_output_lines(process.stdout.fileno(), log_callback)
+                process.wait()
+
+            # Since we combined streams, stderr will be None, and there is no
+            # second pipe that could fill up while stdout is being drained.
             # The return code is the source of truth for success/failure.
             return process.returncode, ""
 
@@ -41,87 +179,300 @@ class PipService:
             log_callback(err_msg)
             return -1, err_msg
 
+    def _stream_output_lines(self, fd: int, log_callback):
+        """
+        Reads a pipe in large chunks and passes each complete line to log_callback.
+        os.read returns as soon as any output is available, so lines still arrive
+        live, but a burst of output costs one read call instead of one per line.
+        """
+        pending = b''
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk: # EOF: the process closed its output
+                break
+            # Split before decoding; b'\n' never occurs inside a multi-byte UTF-8 character.
+            *lines, pending = (pending + chunk).split(b'\n')
+            for line in lines:
+                log_callback(line.decode('utf-8', errors='replace').strip())
+        if pending:
+            log_callback(pending.decode('utf-8', errors='replace').strip())
+
     def _has_internet_connection(self):
-        """Checks for a live internet connection by connecting to a reliable host."""
+        """
+        Checks for a live internet connection by connecting to a reliable host.
+        The result is reused for NETWORK_CHECK_TTL seconds, so back-to-back
+        refreshes don't each pay for the probe (up to 3 seconds when offline).
+        """
+        checked_at, is_online = self._net_cache
+        if time.monotonic() - checked_at < self.NETWORK_CHECK_TTL:
+            return is_online
         try:
             # Connect to a well-known, highly available DNS server with a short timeout.
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
-            return True
+            with socket.create_connection(("8.8.8.8", 53), timeout=3):
+                is_online = True
         except (OSError, socket.timeout):
-            return False
+            is_online = False
+        self._net_cache = (time.monotonic(), is_online)
+        return is_online
 
     def get_local_packages(self):
         """
         Fetches only the user-installed packages from the local environment.
-        This is a fast, offline-safe operation.
+        This is a fast, offline-safe operation: the user site-packages directory is
+        read in-process via importlib.metadata, the same data 'pip list --user'
+        reports, without starting a pip process.
         """
-        proc_all = subprocess.run(
-            ['pip', 'list', '--user', '--format=json'],
-            capture_output=True, text=True, check=True, encoding='utf-8'
-        )
-        return json.loads(proc_all.stdout or '[]')
+        packages = []
+        seen = set()
+        for dist in metadata.distributions(path=[self._user_site]):
+            name = dist.metadata['Name']
+            if not name or _normalize_name(name) in seen:
+                continue
+            seen.add(_normalize_name(name))
+            packages.append({'name': name, 'version': dist.version})
+        return packages
 
-    def get_outdated_packages(self):
+    def _uses_custom_network_config(self) -> bool:
         """
-        Checks for outdated packages. This is a network-intensive operation.
-        Returns a tuple: (dict of outdated info, status message).
+        Returns True if pip is configured to reach its index differently from a
+        direct HTTPS connection to PyPI (see _NETWORK_ENV_VARS and _NETWORK_CONFIG_KEYS).
+        """
+        if any(self._pip_env.get(var) for var in _NETWORK_ENV_VARS):
+            return True
+        config_files = [os.environ.get('PIP_CONFIG_FILE'), *_PIP_CONFIG_FILES]
+        for config_file in filter(None, config_files):
+            config = configparser.ConfigParser(interpolation=None)
+            try:
+                if not config.read(config_file, encoding='utf-8'):
+                    continue # No such file
+            except (configparser.Error, UnicodeDecodeError):
+                return True # Only pip knows what an unreadable config means
+            for section in config.sections():
+                # pip accepts both 'index-url' and 'index_url'
+                if any(key.replace('_', '-') in _NETWORK_CONFIG_KEYS for key in config[section]):
+                    return True
+        return False
+
+    def _pypi_get(self, path: str):
+        """
+        Sends a GET request to PyPI and returns (response, body). Each pool thread
+        reuses one keep-alive connection, so only the first request pays for the TLS handshake.
+        """
+        for attempt in range(2):
+            if self._closing.is_set():
+                raise http.client.HTTPException("shutting down")
+            conn = getattr(self._http_local, 'conn', None)
+            if conn is None:
+                conn = http.client.HTTPSConnection(PYPI_HOST, timeout=self.PYPI_REQUEST_TIMEOUT)
+                self._http_local.conn = conn
+                with self._active_lock:
+                    self._http_conns.add(conn)
+            try:
+                conn.request('GET', path, headers={'Accept': 'application/json'})
+                response = conn.getresponse()
+                body = response.read() # Must be read fully before the connection can be reused
+                return response, body
+            except (OSError, http.client.HTTPException):
+                # The server may have closed an idle connection; retry once on a fresh one
+                conn.close()
+                self._http_local.conn = None
+                with self._active_lock:
+                    self._http_conns.discard(conn)
+                if attempt:
+                    raise
+
+    def _fetch_latest_version(self, package_name: str):
+        """
+        Returns the latest release of a package according to the PyPI JSON API,
+        or None if PyPI doesn't know the package (404). Redirects are followed;
+        any other status raises http.client.HTTPException.
+        """
+        path = f"/pypi/{package_name}/json"
+        for _ in range(PYPI_MAX_REDIRECTS + 1):
+            response, body = self._pypi_get(path)
+            if response.status == 200:
+                return json_compat.loads(body)['info']['version']
+            if response.status == 404:
+                return None
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urlsplit(location)
+                if url.netloc not in ('', PYPI_HOST):
+                    raise http.client.HTTPException(f"redirected off {PYPI_HOST} to {url.netloc}")
+                path = url.path + (f"?{url.query}" if url.query else "")
+                continue
+            raise http.client.HTTPException(f"HTTP {response.status} for {package_name}")
+        raise http.client.HTTPException(f"too many redirects for {package_name}")
+
+    def _get_outdated_packages_http(self, packages) -> dict[str, str]:
+        """
+        Checks the given packages against the PyPI JSON API concurrently.
+        Returns a dict mapping the name of each outdated package to its latest version.
+        Raises FutureTimeoutError if the whole check exceeds OUTDATED_CHECK_TIMEOUT, and
+        http.client.HTTPException if any lookup failed, since a partial result would
+        wrongly mark the unchecked packages as up to date.
         """
+        futures = {self._http_pool.submit(self._fetch_latest_version, pkg['name']): pkg
+                   for pkg in packages}
+        outdated_info = {}
+        failures = []
+        try:
+            for future in as_completed(futures, timeout=self.OUTDATED_CHECK_TIMEOUT):
+                pkg = futures[future]
+                try:
+                    latest_version = future.result()
+                except (OSError, http.client.HTTPException, KeyError, ValueError) as e:
+                    failures.append(e)
+                    continue
+                if latest_version is None:
+                    continue
+                try:
+                    latest, installed = Version(latest_version), Version(pkg['version'])
+                except InvalidVersion:
+                    continue # pip can't compare these either
+                # Like 'pip list --outdated', don't offer pre-releases to users on a final release
+                if latest > installed and (installed.is_prerelease or not latest.is_prerelease):
+                    outdated_info[pkg['name']] = latest_version
+        finally:
+            for future in futures:
+                future.cancel()
+        if failures:
+            raise http.client.HTTPException(
+                f"{len(failures)} of {len(futures)} lookups failed (first error: {failures[0]})")
+        return outdated_info
+
+    def _get_outdated_packages_pip(self):
+        """Runs 'pip list --outdated'. Returns a tuple: (dict of outdated info, status message)."""
         outdated_info = {}
         status_message = None
-        
-        if not self._has_internet_connection():
-            status_message = "Offline: Skipping check for outdated packages."
-        else:
-            try:
-                outdated_cmd = ['pip', 'list', '--user', '--outdated', '--format=json']
-                proc_outdated = subprocess.run(
-                    outdated_cmd, capture_output=True, text=True,
-                    check=False, encoding='utf-8', timeout=15
-                )
-                if proc_outdated.returncode == 0 and proc_outdated.stdout:
-                    outdated_info = {p['name']: p['latest_version'] for p in json.loads(proc_outdated.stdout or '[]')}
-            except subprocess.TimeoutExpired:
+        try:
+            outdated_cmd = self.pip_command('list', '--user', '--outdated', '--format=json')
+            # The JSON is parsed straight from the pipe, without first collecting
+            # pip's whole output into a string; a timer enforces the timeout.
+            with subprocess.Popen(outdated_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                  env=self._pip_env) as proc_outdated:
+                with self._active_lock:
+                    self._outdated_proc = proc_outdated
+                if self._closing.is_set():
+                    proc_outdated.kill()
+                # The flag is set before the kill, so it is reliable once wait() returns
+                timed_out = threading.Event()
+                def on_timeout():
+                    timed_out.set()
+                    proc_outdated.kill()
+                timer = threading.Timer(self.OUTDATED_CHECK_TIMEOUT, on_timeout)
+                timer.daemon = True # A pending timeout must not delay the app's exit
+                timer.start()
+                try:
+                    packages = json_compat.load(proc_outdated.stdout)
+                except json_compat.JSONDecodeError:
+                    packages = None # No usable output; the exit code explains why
+                finally:
+                    proc_outdated.wait()
+                    timer.cancel()
+                    with self._active_lock:
+                        self._outdated_proc = None
+            if timed_out.is_set():
                 status_message = "Network Timeout: Could not check for updates."
-            except Exception as e:
-                status_message = f"Network Error: Could not fetch updates. Details: {e}"
-
+            elif proc_outdated.returncode != 0 or packages is None:
+                status_message = f"Update check failed (pip exited with code {proc_outdated.returncode})."
+            else:
+                outdated_info = {p['name']: p['latest_version'] for p in packages}
+        except Exception as e:
+            status_message = f"Network Error: Could not fetch updates. Details: {e}"
         return outdated_info, status_message
 
-    def get_package_size(self, package_name: str) -> tuple[int, str]:
+    def get_outdated_packages(self):
         """
-        Calculates the total size of a package's files using importlib.metadata.
-        Returns a tuple of (size_in_bytes, formatted_size_string).
+        Checks for outdated packages. This is a network-intensive operation.
+        Packages are looked up on PyPI directly, in parallel, unless 'packaging' is
+        unavailable or pip is configured with another index, a proxy or custom
+        certificates, in which case 'pip list --outdated' is used instead.
+        Returns a tuple: (dict of outdated info, status message).
         """
+        if not self._has_internet_connection():
+            return {}, "Offline: Skipping check for outdated packages."
+        if Version is None or self._uses_custom_network_config():
+            return self._get_outdated_packages_pip()
+
         try:
-            files = metadata.files(package_name)
-            if not files:
-                return 0, "0 B"
-
-            total_size = 0
-            for file_path in files:
-                abs_path = file_path.locate()
-                if abs_path.is_file():
-                    total_size += abs_path.stat().st_size
-            
-            if total_size == 0: return 0, "0 B"
-            
-            # More precise formatting
-            if total_size < 1024:
-                size_str = f"{total_size} B"
-            elif total_size < 1024**2:
-                size_str = f"{total_size / 1024:.1f} KB"
-            elif total_size < 1024**2 * 999: # Show MB up to 999
-                 size_str = f"{total_size / (1024**2):.2f} MB"
-            else: # Show GB for larger sizes
-                size_str = f"{total_size / (1024**3):.2f} GB"
-            
-            return total_size, size_str
-            
-        except metadata.PackageNotFoundError:
-            return 0, "Not Found"
+            return self._get_outdated_packages_http(self.get_local_packages()), None
+        except FutureTimeoutError:
+            return {}, "Network Timeout: Could not check for updates."
         except Exception as e:
-            print(f"Error calculating size for {package_name}: {e}")
-            return 0, "Error"
+            return {}, f"Network Error: Could not fetch updates. Details: {e}"
+
+    def start_outdated_check(self) -> Future:
+        """
+        Starts get_outdated_packages in the background and returns its Future,
+        so the network check runs while the local package list is being read.
+        """
+        return self._pool.submit(self.get_outdated_packages)
+
+    def _distribution_size(self, dist: metadata.Distribution) -> int:
+        """
+        Sums the size of a distribution's files from its RECORD metadata.
+        RECORD already stores the byte size of each installed file, so the disk
+        is only touched for entries without one (e.g. compiled .pyc files), and
+        those are read with one directory scan per directory rather than a stat per path.
+        """
+        files = dist.files
+        if not files:
+            return 0
+
+        total_size = 0
+        unsized_files: dict[str, set[str]] = {}
+        base_dir = None
+        for file_path in files:
+            if file_path.size is not None:
+                total_size += file_path.size
+                continue
+            # Join plain strings rather than calling locate(), which builds a Path per file
+            if base_dir is None:
+                base_dir = os.fspath(dist.locate_file(''))
+            directory, file_name = os.path.split(os.path.join(base_dir, file_path))
+            unsized_files.setdefault(directory, set()).add(file_name)
+
+        for directory, file_names in unsized_files.items():
+            total_size += _scan_file_sizes(directory, file_names)
+        return total_size
+
+    def get_all_sizes(self, package_names) -> dict[str, tuple[int, str]]:
+        """
+        Calculates the sizes of many packages. The requested distributions are found
+        in a single pass over the user site (the same location get_local_packages
+        lists), then sized concurrently on a bounded pool, since reading RECORD files
+        and scanning directories is I/O bound.
+        Returns a dict mapping each requested name to (size_in_bytes, formatted_size_string).
+        """
+        wanted = {_normalize_name(name): name for name in package_names}
+        found = {}
+        for dist in metadata.distributions(path=[self._user_site]):
+            name = wanted.pop(_normalize_name(dist.metadata['Name'] or ''), None)
+            if name is None:
+                # Not requested, or a duplicate entry
+                continue
+            found[name] = dist
+            if not wanted:
+                break
+
+        sizes = {}
+        futures = {self._size_pool.submit(self._distribution_size, dist): name
+                   for name, dist in found.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            if future.cancelled(): # The app is exiting
+                continue
+            try:
+                total_size = future.result()
+                sizes[name] = (total_size, _format_size(total_size))
+            except Exception as e:
+                print(f"Error calculating size for {name}: {e}")
+                sizes[name] = (0, "Error")
+
+        for name in wanted.values():
+            sizes[name] = (0, "Not Found")
+        return sizes
 
     def get_cache_size(self) -> str:
         """
@@ -129,29 +480,17 @@ class PipService:
         size lines, and returning a single total.
         Returns a human-readable size string (e.g., "123.4 MB").
         """
-        import re
         try:
             process = subprocess.run(
-                ['pip', 'cache', 'info'],
-                capture_output=True, text=True, check=True, encoding='utf-8'
+                self.pip_command('cache', 'info'),
+                capture_output=True, check=True,
+                env=self._pip_env
             )
             
             total_bytes = 0
-            # Regex to find a number (int or float) and a unit (MB, kB, B)
-            size_pattern = re.compile(r'(\d+\.?\d*)\s*(MB|kB|B)', re.IGNORECASE)
-
-            for line in process.stdout.splitlines():
-                if "size:" in line:
-                    match = size_pattern.search(line)
-                    if match:
-                        value_str, unit = match.groups()
-                        value = float(value_str)
-                        if unit.upper() == 'MB':
-                            total_bytes += value * 1024 * 1024
-                        elif unit.upper() == 'KB':
-                            total_bytes += value * 1024
-                        elif unit.upper() == 'B':
-                            total_bytes += value
+            for match in _CACHE_SIZE_PATTERN.finditer(process.stdout):
+                value_str, unit = match.groups()
+                total_bytes += float(value_str) * _UNIT_BYTES[unit.upper()]
             
             # Format the total bytes back into a human-readable string
             if total_bytes < 1024:
@@ -163,7 +502,7 @@ class PipService:
             else:
                 return f"{total_bytes / (1024**3):.2f} GB"
 
-        except (subprocess.CalledProcessError, FileNotFoundError, ImportError):
+        except (subprocess.CalledProcessError, FileNotFoundError):
             return "" # Return empty string on error
 
     def get_package_details(self, package_name: str) -> dict | None:
@@ -211,11 +550,12 @@ class PipService:
         try:
             # `pip check` prints its report to stdout and returns non-zero on issues.
             process = subprocess.run(
-                ['pip', 'check'], 
+                self.pip_command('check'),
                 capture_output=True, 
                 text=True, 
                 check=False, # Important: Don't raise exception on non-zero exit
-                encoding='utf-8'
+                encoding='utf-8',
+                env=self._pip_env
             )
             # The useful output can be in stdout (for errors) or stderr (for other issues)
             output = process.stdout + process.stderr
@@ -1,3 +1,4 @@
+import collections
 import gi
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk, GLib, Gio, Pango
@@ -5,11 +6,43 @@ from gi.repository import Gtk, GLib, Gio, Pango
 # Import our new logic class
 from services.app_logic import AppLogic
 from models.package import Package
+from models.package_gobject import PackageGObject
+
+# Builder template for a column cell: a label bound to one PackageGObject property.
+_LABEL_FACTORY_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<interface>
+  <template class="GtkListItem">
+    <property name="child">
+      <object class="GtkLabel">
+        <property name="xalign">0</property>
+        <property name="single-line-mode">true</property>
+        <property name="ellipsize">end</property>
+        <property name="use-markup">{use_markup}</property>
+        <binding name="label">
+          <lookup name="{property_name}" type="PackageGObject">
+            <lookup name="item">GtkListItem</lookup>
+          </lookup>
+        </binding>
+      </object>
+    </property>
+  </template>
+</interface>
+"""
+
+# The column templates are rendered and encoded once, at import time.
+_LABEL_FACTORY_UI = {
+    (property_name, use_markup): GLib.Bytes.new(_LABEL_FACTORY_TEMPLATE.format(
+        property_name=property_name, use_markup=str(use_markup).lower()).encode('utf-8'))
+    for property_name, use_markup in (("name", False), ("display-version", True), ("size-str", False))
+}
 
 @Gtk.Template(filename='ui/pipman.ui')
 class PipManagerWindow(Gtk.ApplicationWindow):
     __gtype_name__ = 'PipManagerWindow'
 
+    # The package details shown in the details dialog, in display order
+    _DETAIL_KEYS = ('Summary', 'Home-page', 'Author', 'License', 'Requires', 'Required-by')
+
     # --- Template Children (UI Widgets) ---
     details_button = Gtk.Template.Child()
     search_entry = Gtk.Template.Child()
@@ -27,12 +60,20 @@ class PipManagerWindow(Gtk.ApplicationWindow):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.scroll_position = 0
+        self._selected_pkg = None # PackageGObject of the selected row, kept by on_selection_changed
+        self._scroll_restore_upper = 0.0
+        self._scroll_restore_retried = False
 
-        # The ListStore holds the master list of all package names
-        self.list_store = Gio.ListStore(item_type=Gtk.StringObject)
+        # The ListStore holds a PackageGObject wrapper for every package
+        self.list_store = Gio.ListStore(item_type=PackageGObject)
+        # Maps each package name to its row in list_store; replaced on every refresh.
+        self._name_to_index: dict[str, int] = {}
 
         # --- NEW: Create a filter and a model that uses it ---
-        self.filter = Gtk.CustomFilter.new(self._filter_func)
+        # Matches the search text anywhere in the package name, ignoring case, entirely in C
+        self.filter = Gtk.StringFilter.new(Gtk.PropertyExpression.new(PackageGObject, None, "name"))
+        self.filter.set_ignore_case(True)
+        self.filter.set_match_mode(Gtk.StringFilterMatchMode.SUBSTRING)
         self.filter_model = Gtk.FilterListModel(model=self.list_store, filter=self.filter)
         # --- END NEW ---
 
@@ -42,7 +83,8 @@ class PipManagerWindow(Gtk.ApplicationWindow):
             'log_output': self.log_output,
             'set_busy': self.set_ui_busy,
             'update_package_list': self.update_package_list_store,
-            'update_package_view': self.update_package_view,
+            'update_package_views': self.update_package_views,
+            'refresh_package_views': self.refresh_package_views,
             'set_total_size_label': self.total_size_label.set_text,
             'set_cache_button_tooltip': self.clear_cache_button.set_tooltip_text,
             'show_details_dialog': self.show_details_dialog,
@@ -52,11 +94,11 @@ class PipManagerWindow(Gtk.ApplicationWindow):
         
         # --- UI Initialization ---
         self.log_buffer = self.output_textview.get_buffer()
-        self.log_buffer.create_tag("header", weight=Pango.Weight.BOLD)
-        
-        # --- NEW: Connect search bar signal ---
-        self.search_entry.connect("search-changed", self.on_search_changed)
-        # --- END NEW ---
+        self._header_tag = self.log_buffer.create_tag("header", weight=Pango.Weight.BOLD)
+        # Log messages are queued and written to the buffer in one idle pass
+        self._log_queue = collections.deque()
+        self._log_flush_scheduled = False
+        self._scroll_pending = False
         
         self.setup_column_view()
 
@@ -67,17 +109,17 @@ class PipManagerWindow(Gtk.ApplicationWindow):
     def setup_column_view(self):
         # 1.  Build the columns exactly as before …
         # -------------------------------------------
-        # --- FIX: Use a custom sorter for clarity ---
-        self.name_sorter    = Gtk.CustomSorter.new(self._name_sort_func)
-        self.version_sorter = Gtk.CustomSorter.new(self._version_sort_func)
-        self.size_sorter    = Gtk.CustomSorter.new(self._size_sort_func)
+        # Sorters compare PackageGObject properties in C, without calling back into Python
+        self.name_sorter    = Gtk.StringSorter.new(Gtk.PropertyExpression.new(PackageGObject, None, "name"))
+        self.version_sorter = Gtk.StringSorter.new(Gtk.PropertyExpression.new(PackageGObject, None, "sort-key"))
+        self.size_sorter    = Gtk.NumericSorter.new(Gtk.PropertyExpression.new(PackageGObject, None, "size-bytes"))
 
         self.column_view.append_column(
-            self._create_column("Package Name", self._bind_name, self.name_sorter))
+            self._create_column("Package Name", "name",            self.name_sorter))
         self.column_view.append_column(
-            self._create_column("Version",      self._bind_version, self.version_sorter))
+            self._create_column("Version",      "display-version", self.version_sorter, use_markup=True))
         self.column_view.append_column(
-            self._create_column("Size",         self._bind_size,    self.size_sorter))
+            self._create_column("Size",         "size-str",        self.size_sorter))
 
         # 2.  **Get the special sorter from the view and give it to the sort model**
         # -------------------------------------------------------------------------
@@ -88,8 +130,13 @@ class PipManagerWindow(Gtk.ApplicationWindow):
 
         # 3.  Wrap selection and finish as before
         # ---------------------------------------
-        self.selection_model = Gtk.SingleSelection(model=self.sort_model)
-        self.selection_model.connect("selection-changed", self.on_selection_changed)
+        # Without autoselect, a model change never moves the selection to another row;
+        # the selected item keeps its selection when its row is re-emitted.
+        self.selection_model = Gtk.SingleSelection(model=self.sort_model, autoselect=False,
+                                                   can_unselect=True)
+        # selection-changed isn't emitted when the selected item leaves the model
+        # (refresh, uninstall, search), but selected-item is always notified.
+        self.selection_model.connect("notify::selected-item", self.on_selection_changed)
         self.column_view.set_model(self.selection_model)
 
         # 4.  (Optional) choose an initial order
@@ -99,75 +146,88 @@ class PipManagerWindow(Gtk.ApplicationWindow):
             self.column_view.sort_by_column(columns.get_item(0),
                                             Gtk.SortType.ASCENDING)
 
-    def _create_column(self, title: str, bind_callback, sorter: Gtk.Sorter):
+    def _create_column(self, title: str, property_name: str, sorter: Gtk.Sorter,
+                       use_markup: bool = False):
         """Helper to create a ColumnViewColumn with a label factory and a sorter."""
-        factory = Gtk.SignalListItemFactory()
-        factory.connect("setup", lambda fac, item: item.set_child(Gtk.Label(xalign=0)))
-        factory.connect("bind", bind_callback)
+        factory = self._create_label_factory(property_name, use_markup)
         
         column = Gtk.ColumnViewColumn(title=title, factory=factory)
         
         column.set_sorter(sorter)     # Set the sorter for this column
         return column
 
-    # --- Data Binding Callbacks ---
-    def _get_pkg_from_list_item(self, list_item) -> Package | None:
-        """Gets the package object from AppLogic based on the list item."""
-        string_object = list_item.get_item()
-        if not string_object: return None
-        pkg_name = string_object.get_string()
-        return self.logic.packages_data.get(pkg_name)
-
-    def _bind_name(self, factory, list_item):
-        """Binds the package name."""
-        label = list_item.get_child()
-        pkg = self._get_pkg_from_list_item(list_item)
-        if pkg:
-            label.set_text(pkg.name)
-
-    def _bind_version(self, factory, list_item):
-        """Binds the package version."""
-        label = list_item.get_child()
-        pkg = self._get_pkg_from_list_item(list_item)
-        if pkg:
-            label.set_markup(pkg.display_version)
-
-    def _bind_size(self, factory, list_item):
-        """Binds the package size."""
-        label = list_item.get_child()
-        pkg = self._get_pkg_from_list_item(list_item)
-        if pkg:
-            label.set_text(pkg.size_str)
+    # --- Data Binding ---
+    def _create_label_factory(self, property_name: str, use_markup: bool) -> Gtk.ListItemFactory:
+        """
+        Creates a factory whose label is bound to a PackageGObject property.
+        The binding is evaluated by GTK itself, so rows are set up and bound
+        without calling back into Python, and labels follow property changes.
+        """
+        return Gtk.BuilderListItemFactory.new_from_bytes(None, _LABEL_FACTORY_UI[(property_name, use_markup)])
 
     # --- UI Update Callbacks (from AppLogic to UI) ---
-    def update_package_list_store(self, package_names: list[str]):
-        """Receives a list of package names from AppLogic and updates the store."""
-        self.list_store.remove_all()
-        for name in package_names:
-            self.list_store.append(Gtk.StringObject.new(name))
-        # The SortListModel will re-sort automatically.
+    def update_package_list_store(self, packages: list[Package]):
+        """
+        Receives the list of packages from AppLogic and updates the store.
+        AppLogic delivers the packages in the same stable order (str.casefold by name)
+        on every refresh; the in-place patch below depends on that. The order is close
+        to, but not the same as, the name column's Unicode collation, so the sorter
+        still does the real sorting.
+        """
+        old_index = self._name_to_index
+        new_index = {pkg.name: i for i, pkg in enumerate(packages)}
+        removed = [i for name, i in old_index.items() if name not in new_index]
+        added = [i for name, i in new_index.items() if name not in old_index]
+
+        if len(removed) + len(added) > len(packages) // 4:
+            # Replace the whole contents with one splice, so the filter and sort
+            # models see a single change instead of one per package.
+            items = [PackageGObject(pkg) for pkg in packages]
+            # The filter and sorter are detached while the store changes, so each runs
+            # once over the final contents when it is put back.
+            sorter = self.sort_model.get_sorter()
+            self.sort_model.set_sorter(None)
+            self.filter_model.set_filter(None)
+            self.list_store.splice(0, self.list_store.get_n_items(), items)
+            self.filter_model.set_filter(self.filter)
+            self.sort_model.set_sorter(sorter)
+        else:
+            # Only a few packages came or went: patch the store in place. Old and new
+            # lists share the same order, so removing from the end first and then
+            # inserting at the new indices in ascending order leaves every row in place.
+            for i in sorted(removed, reverse=True):
+                self.list_store.splice(i, 1, [])
+            for i in added:
+                self.list_store.splice(i, 0, [PackageGObject(packages[i])])
+            # Kept rows take the new Package objects; only changed ones are redrawn
+            changed = [i for i, pkg in enumerate(packages)
+                       if pkg.name in old_index and self.list_store.get_item(i).set_package(pkg)]
+            if changed:
+                span = changed[-1] - changed[0] + 1
+                self.list_store.items_changed(changed[0], span, span)
+
+        self._name_to_index = new_index
         self._update_button_sensitivity()
 
-    def update_package_view(self, pkg_name: str):
-        """Tells the list view to redraw a specific row."""
-        # --- FIX: Preserve scroll position and selection ---
-        selected_item = self.selection_model.get_selected_item()
-        selected_pkg_name = None
-        if selected_item:
-            selected_pkg_name = selected_item.get_string()
-
-        for i, item in enumerate(self.list_store):
-            if item.get_string() == pkg_name:
-                self.list_store.items_changed(i, 1, 1)
-                break
-
-        if selected_pkg_name:
-            # Find the Gtk.StringObject for the previously selected package
-            for i, item in enumerate(self.sort_model): # Iterate through the *sorted* model
-                if item.get_string() == selected_pkg_name:
-                    # Reselect the item in the selection model
-                    self.selection_model.select_item(i, True)
-                    break
+    def update_package_views(self, pkg_names: list[str]):
+        """Redraws the given packages' rows with a single items_changed over their span."""
+        indices = [self._name_to_index[name] for name in pkg_names if name in self._name_to_index]
+        # Rows whose displayed values are unchanged are left alone
+        indices = [i for i in indices if self.list_store.get_item(i).sync()]
+        if not indices:
+            return
+        first = min(indices)
+        span = max(indices) - first + 1
+        # The selection follows the selected item through the change by itself
+        # (see the SingleSelection setup), so it doesn't need to be restored here.
+        self.list_store.items_changed(first, span, span)
+
+    def refresh_package_views(self):
+        """Tells the list view to redraw every changed row in a single invalidation."""
+        changed = [i for i, item in enumerate(self.list_store) if item.sync()]
+        if changed:
+            span = changed[-1] - changed[0] + 1
+            self.list_store.items_changed(changed[0], span, span)
 
     def set_ui_busy(self, busy: bool):
         """Toggles the sensitivity of UI widgets."""
@@ -181,16 +241,13 @@ class PipManagerWindow(Gtk.ApplicationWindow):
     def _update_button_sensitivity(self):
         """Updates button sensitivity based on selection and busy state."""
         is_busy = self.logic.is_busy
-        selected_item = self.selection_model.get_selected_item()
-        pkg = None
-        if selected_item:
-             pkg = self.logic.packages_data.get(selected_item.get_string())
+        selected_item = self._selected_pkg
 
-        can_interact = (pkg is not None) and not is_busy
+        can_interact = (selected_item is not None) and not is_busy
         
         self.details_button.set_sensitive(can_interact)
         self.uninstall_button.set_sensitive(can_interact)
-        self.update_button.set_sensitive(can_interact and pkg.is_outdated if pkg else False)
+        self.update_button.set_sensitive(can_interact and selected_item.is_outdated)
 
     # --- UI Event Handlers (from User to AppLogic) ---
     @Gtk.Template.Callback()
@@ -203,13 +260,13 @@ class PipManagerWindow(Gtk.ApplicationWindow):
     def on_update_clicked(self, widget):
         selected_item = self.selection_model.get_selected_item()
         if selected_item:
-            self.logic.update_package(selected_item.get_string())
+            self.logic.update_package(selected_item.name)
 
     @Gtk.Template.Callback()
     def on_uninstall_clicked(self, widget):
         selected_item = self.selection_model.get_selected_item()
         if selected_item:
-            pkg_name = selected_item.get_string()
+            pkg_name = selected_item.name
             dialog = Gtk.MessageDialog(transient_for=self, modal=True, message_type=Gtk.MessageType.QUESTION,
                                        buttons=Gtk.ButtonsType.YES_NO, text=f"Uninstall '{pkg_name}'?")
             dialog.connect("response", self._on_uninstall_dialog_response, pkg_name)
@@ -232,59 +289,65 @@ class PipManagerWindow(Gtk.ApplicationWindow):
     def on_check_dependencies_clicked(self, widget):
         self.logic.check_dependencies()
         
-    def on_selection_changed(self, selection, position, n_items):
+    def on_selection_changed(self, selection, *args):
+        self._selected_pkg = selection.get_selected_item()
         self._update_button_sensitivity()
 
     # --- Logging ---
     def log_output(self, message: str, is_header: bool = False):
+        self._log_queue.append((message, is_header))
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            # A short timer lets a burst of output collect into a single buffer update
+            GLib.timeout_add(50, self._flush_log)
+
+    def _flush_log(self):
+        """Writes all queued log messages, joining consecutive plain lines into one insert."""
+        self._log_flush_scheduled = False
+        # Inserting moves the iter to the end of the new text, so one lookup serves the whole flush
         end_iter = self.log_buffer.get_end_iter()
-        if is_header:
-            if self.log_buffer.get_char_count() > 0: self.log_buffer.insert(end_iter, "\n")
-            self.log_buffer.insert_with_tags_by_name(self.log_buffer.get_end_iter(), f"--- {message} ---\n", "header")
-        else:
-            self.log_buffer.insert(self.log_buffer.get_end_iter(), f"{message}\n")
+        plain_lines = []
+        while self._log_queue:
+            message, is_header = self._log_queue.popleft()
+            if not is_header:
+                plain_lines.append(f"{message}\n")
+                continue
+            if plain_lines:
+                self.log_buffer.insert(end_iter, "".join(plain_lines))
+                plain_lines.clear()
+            if not end_iter.is_start(): self.log_buffer.insert(end_iter, "\n")
+            self.log_buffer.insert_with_tags(end_iter, f"--- {message} ---\n", self._header_tag)
+        if plain_lines:
+            self.log_buffer.insert(end_iter, "".join(plain_lines))
         
-        GLib.idle_add(self._scroll_output_to_end)
+        # At most one scroll is pending, however many flushes happen before it runs
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            GLib.idle_add(self._scroll_output_to_end, priority=GLib.PRIORITY_DEFAULT_IDLE)
+        return False
 
     def _scroll_output_to_end(self):
+        self._scroll_pending = False
         adj = self.output_textview.get_parent().get_vadjustment()
         adj.set_value(adj.get_upper())
         return False
 
-    def _filter_func(self, string_object) -> bool:
-        """
-        This is the actual filter function. It returns True if a package
-        should be shown, and False if it should be hidden.
-        """
-        # Get the current search text, remove whitespace, and make it lowercase
-        search_text = self.search_entry.get_text().strip().lower()
-        
-        # If the search bar is empty, show everything
-        if not search_text:
-            return True
-            
-        # Get the package name from the Gtk.StringObject and make it lowercase
-        pkg_name = string_object.get_string().lower()
-        
-        # Return True only if the search text is part of the package name
-        return search_text in pkg_name
-
     @Gtk.Template.Callback()
     def on_search_changed(self, search_entry):
         """
-        Called every time the user types in the search bar.
-        This tells the filter that it needs to be re-evaluated.
+        Called when the user pauses typing in the search bar; GtkSearchEntry
+        already delays the signal (its search-delay property), so no extra timer is needed.
         """
-        # The Gtk.FilterChange.DIFFERENT flag tells the filter that it needs to
-        # re-run the _filter_func on all items.
-        self.filter.changed(Gtk.FilterChange.DIFFERENT)
+        # The filter works out by itself whether the new text narrows or widens
+        # the previous search, and only re-checks the rows that can change.
+        self.filter.set_search(search_entry.get_text().strip())
 
     @Gtk.Template.Callback()
     def on_details_clicked(self, widget):
         """Called when the 'Details' button is clicked."""
         selected_item = self.selection_model.get_selected_item()
         if selected_item:
-            self.logic.show_package_details(selected_item.get_string())
+            self.logic.show_package_details(selected_item.name)
 
     def show_details_dialog(self, details: dict):
         """Creates and displays a dialog with the package details."""
@@ -295,66 +358,23 @@ class PipManagerWindow(Gtk.ApplicationWindow):
         # --- FIX START ---
         # Combine primary and secondary text into a single markup string
         # because Gtk.MessageDialog in GTK4 does not have format_secondary_markup.
-        
-        # Primary title part (e.g., "PackageName (Version)")
-        title_markup = f"<b>{details.get('Name', 'N/A')}</b> <small>({details.get('Version', 'N/A')})</small>"
-        
-        # Create a more detailed secondary text, making some fields bold
-        lines = []
-        # Define which keys we want to display and in what order
-        display_keys = ['Summary', 'Home-page', 'Author', 'License', 'Requires', 'Required-by']
-        for key in display_keys:
-            if key in details and details[key]: # Only show if it exists and is not empty
-                # IMPORTANT: Escape the value to prevent any potential Pango markup
-                # in the package details from breaking the display or causing crashes.
-                escaped_value = GLib.markup_escape_text(details[key])
-                lines.append(f"<b>{key}:</b> {escaped_value}")
-        
-        # Join the secondary lines with newlines
-        secondary_text_markup = "\n".join(lines)
-
-        # Join the title and secondary text with some spacing between them
-        full_dialog_markup = f"{title_markup}\n\n{secondary_text_markup}"
-
-        # Set the entire combined content as the main dialog message using markup
-        dialog.set_markup(full_dialog_markup)
+        # IMPORTANT: Every value is escaped to prevent any potential Pango markup
+        # in the package details from breaking the display or causing crashes.
+        escape = GLib.markup_escape_text
+        # get_package_details always sets Name and Version, but they may be None
+        title_markup = (f"<b>{escape(details.get('Name') or 'N/A')}</b> "
+                        f"<small>({escape(details.get('Version') or 'N/A')})</small>")
+        # Only show fields that exist and are not empty
+        secondary_text_markup = "\n".join(
+            f"<b>{key}:</b> {escape(value)}"
+            for key in self._DETAIL_KEYS if (value := details.get(key)))
+        dialog.set_markup(f"{title_markup}\n\n{secondary_text_markup}")
         # --- FIX END ---
         
         # Connect the close response and show the dialog
         dialog.connect("response", lambda d, r: d.destroy())
         dialog.present()
 
-    def _version_sort_func(self, pkg1_str_obj, pkg2_str_obj, *args):
-        pkg1 = self.logic.packages_data.get(pkg1_str_obj.get_string())
-        pkg2 = self.logic.packages_data.get(pkg2_str_obj.get_string())
-
-        if not pkg1 or not pkg2: return 0 # Should not happen
-
-        # Prioritize outdated packages
-        if pkg1.is_outdated and not pkg2.is_outdated: return -1
-        if not pkg1.is_outdated and pkg2.is_outdated: return 1
-
-        # Fallback to alphabetical sort if both are outdated or both are up-to-date
-        return GLib.strcmp0(pkg1.name, pkg2.name)
-
-    def _size_sort_func(self, pkg1_str_obj, pkg2_str_obj, *args):
-        pkg1 = self.logic.packages_data.get(pkg1_str_obj.get_string())
-        pkg2 = self.logic.packages_data.get(pkg2_str_obj.get_string())
-
-        if not pkg1 or not pkg2: return 0 # Should not happen
-
-        # Sort by size_bytes (numeric)
-        return pkg1.size_bytes - pkg2.size_bytes
-
-    def _name_sort_func(self, pkg1_str_obj, pkg2_str_obj, *args):
-        pkg1 = self.logic.packages_data.get(pkg1_str_obj.get_string())
-        pkg2 = self.logic.packages_data.get(pkg2_str_obj.get_string())
-
-        if not pkg1 or not pkg2: return 0 # Should not happen
-
-        # A negative value if a < b, 0 if a = b, a positive value if a > b
-        return GLib.strcmp0(pkg1.name.lower(), pkg2.name.lower())
-
     def on_sorter_changed(self, sorter, *args):
         """
         When sorting changes, deselect any selected package to prevent
@@ -368,9 +388,11 @@ class PipManagerWindow(Gtk.ApplicationWindow):
         if scrolled_window:
             adjustment = scrolled_window.get_vadjustment()
             self.scroll_position = adjustment.get_value()
+            self._scroll_restore_upper = adjustment.get_upper()
+            self._scroll_restore_retried = False
             
-            # Schedule scroll position restoration with bounds checking
-            GLib.timeout_add(50, self.restore_scroll_position)
+            # Restore the position once the main loop has handled the re-sort
+            GLib.idle_add(self.restore_scroll_position, priority=GLib.PRIORITY_LOW)
         
         # 3. Update button sensitivity to reflect deselection
         self._update_button_sensitivity()
@@ -379,12 +401,18 @@ class PipManagerWindow(Gtk.ApplicationWindow):
         """Restores the scrollbar to its saved position with bounds checking."""
         scrolled_window = self.column_view.get_parent()
         if not scrolled_window:
-            return False # Stop the timeout
+            return False # Stop the idle callback
 
         adjustment = scrolled_window.get_vadjustment()
         max_position = adjustment.get_upper() - adjustment.get_page_size()
         valid_position = min(max_position, self.scroll_position)
         valid_position = max(0, valid_position)  # Ensure it's not negative
         adjustment.set_value(valid_position)
-        
+
+        # If the list's height was still changing, run once more after it settles
+        upper = adjustment.get_upper()
+        if upper != self._scroll_restore_upper and not self._scroll_restore_retried:
+            self._scroll_restore_upper = upper
+            self._scroll_restore_retried = True
+            return True
         return False
\ No newline at end of file